@@ -8,6 +8,7 @@ to guide Playwright browser automation for Twitter data extraction.
 import os
 import json
 import base64
+import hashlib
 import random
 import logging
 import asyncio
@@ -17,10 +18,57 @@ from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 import openai
-from playwright.async_api import async_playwright, Page, BrowserContext, Browser
+from playwright.async_api import async_playwright, Page, BrowserContext, Browser, TimeoutError as PlaywrightTimeoutError
 
 from utils.logging_config import logger
 
+# Enhanced browser arguments based on ZenRows recommendations, shared by
+# every browser the extractor launches so they all present the same fingerprint
+_BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-features=IsolateOrigins",
+    "--disable-site-isolation-trials",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-accelerated-2d-canvas",
+    "--disable-gpu",
+    "--hide-scrollbars",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--no-zygote",
+    "--window-size=1920,1080",
+    # Additional args from ZenRows
+    "--font-render-hinting=none",
+    "--disable-features=IsolateOrigins,site-per-process,SitePerProcess",
+    "--disable-web-security",
+    "--ignore-certificate-errors",
+    "--ignore-certificate-errors-spki-list",
+    f"--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+]
+
+# Enhanced context parameters
+_CONTEXT_PARAMS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "screen": {"width": 1920, "height": 1080},  # Added screen size
+    "color_scheme": "dark",
+    "locale": "en-AU",
+    "timezone_id": "Australia/Perth",
+    "geolocation": {
+        "latitude": -31.9523,
+        "longitude": 115.8613,
+        "accuracy": 100,
+    },
+    "permissions": ["geolocation", "notifications"],
+    "ignore_https_errors": True,
+    "has_touch": False,
+    "is_mobile": False,
+    "device_scale_factor": 2,
+    "accept_downloads": False,  # Added from ZenRows
+    "java_script_enabled": True,  # Added from ZenRows
+    "bypass_csp": True,  # Added from ZenRows
+}
+
 class VisionTwitterExtractor:
     """
     Extract tweets from Twitter using OpenAI Vision to guide browser automation.
@@ -52,6 +100,11 @@ class VisionTwitterExtractor:
         # Ensure the directory exists
         os.makedirs(self.screenshots_dir, exist_ok=True)
         self.headless = self.params.get('headless', True)
+        
+        # Vision responses keyed by screenshot hash; disabled when not set
+        self.screenshot_cache_dir = self.params.get('screenshot_cache_dir')
+        if self.screenshot_cache_dir:
+            os.makedirs(self.screenshot_cache_dir, exist_ok=True)
         self.user_data_dir = self.params.get('user_data_dir', os.path.join(tempfile.gettempdir(), 'twitter_browser_data'))
         
         # OpenAI configuration from environment
@@ -60,7 +113,8 @@ class VisionTwitterExtractor:
         
         # OpenAI client
         openai.api_key = self.openai_api_key
-        self.client = openai.OpenAI(api_key=self.openai_api_key)
+        # Async client so vision calls for concurrent handles don't block the event loop
+        self.client = openai.AsyncOpenAI(api_key=self.openai_api_key)
         
         # Create directories
         os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
@@ -142,70 +196,92 @@ class VisionTwitterExtractor:
                 }
             }
     
+    async def export_storage_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Log in through the persistent browser profile and return its storage state.
+        
+        The returned state can seed new browser contexts for extract_one.
+        Returns None if the login fails.
+        """
+        try:
+            await self._setup_browser()
+            if not await self._login():
+                self.logger.error("Failed to login to Twitter")
+                return None
+            return await self.browser.storage_state()
+        except Exception as e:
+            self.logger.error(f"Error exporting storage state: {e}")
+            return None
+        finally:
+            await self._close_browser()
+    
+    async def extract_one(self, handle: str, page: Page) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract tweets for a single handle on an externally created page.
+        
+        The page's context must already be logged in (e.g. created with the
+        state from export_storage_state). The page is left open so the caller
+        can reuse it for later handles and close it along with its context.
+        Several calls can run concurrently, each on its own page.
+        """
+        try:
+            self.logger.info(f"Extracting tweets for @{handle}")
+            await self._open_profile(page, handle)
+            
+            handle_tweets = await self._extract_tweets_for_handle(handle, page=page)
+            self.logger.info(f"Extracted {len(handle_tweets)} tweets from @{handle}")
+        except Exception as e:
+            self.logger.error(f"Error extracting tweets for @{handle}: {e}")
+            handle_tweets = []
+        
+        return {handle: handle_tweets}
+    
+    async def _open_profile(self, page: Page, handle: str) -> None:
+        """Navigate a (possibly reused) page to a handle's profile and wait for tweets."""
+        await page.goto(f"https://twitter.com/{handle}", wait_until="domcontentloaded")
+        try:
+            await page.wait_for_selector("[data-testid='tweet']", timeout=15000)
+        except PlaywrightTimeoutError:
+            self.logger.warning(f"No tweets rendered for @{handle} within 15s")
+        # Reset the scroll position left over from the previous handle
+        await page.evaluate("window.scrollTo(0, 0)")
+    
+    async def launch_browser(self, playwright) -> Browser:
+        """
+        Launch a non-persistent Chromium with the same arguments as the login profile.
+        
+        Pair with new_context() so contexts seeded from export_storage_state
+        replay the cookies under the fingerprint they were created with.
+        """
+        return await playwright.chromium.launch(
+            headless=self.headless,
+            args=_BROWSER_ARGS,
+            **self._chrome_launch_kwargs(),
+        )
+    
+    async def new_context(self, browser: Browser, storage_state: Optional[Dict[str, Any]] = None) -> BrowserContext:
+        """Create a context on browser with the extractor's context settings and stealth scripts."""
+        context = await browser.new_context(storage_state=storage_state, **_CONTEXT_PARAMS)
+        await self._inject_enhanced_stealth_scripts(context)
+        return context
+    
+    def _chrome_launch_kwargs(self) -> Dict[str, Any]:
+        """Return launch kwargs for a system Chrome from PLAYWRIGHT_CHROME_PATH, if one is set."""
+        # If the user has provided a system Chrome path via env var, prefer that over the bundled browser
+        system_chrome_path = os.environ.get("PLAYWRIGHT_CHROME_PATH")
+        if system_chrome_path and os.path.isfile(system_chrome_path):
+            self.logger.info(f"Using system Chrome executable from PLAYWRIGHT_CHROME_PATH: {system_chrome_path}")
+            return {"executable_path": system_chrome_path}
+        return {}
+    
     async def _setup_browser(self) -> None:
         """Initialize the browser and set up a new page."""
         self.playwright = await async_playwright().start()
         
-        # Enhanced browser arguments based on ZenRows recommendations
-        browser_args = [
-            "--disable-blink-features=AutomationControlled",
-            "--disable-features=IsolateOrigins",
-            "--disable-site-isolation-trials",
-            "--no-sandbox",
-            "--disable-setuid-sandbox",
-            "--disable-dev-shm-usage",
-            "--disable-accelerated-2d-canvas",
-            "--disable-gpu",
-            "--hide-scrollbars",
-            "--no-first-run",
-            "--no-default-browser-check",
-            "--no-zygote",
-            "--window-size=1920,1080",
-            # Additional args from ZenRows
-            "--font-render-hinting=none",
-            "--disable-features=IsolateOrigins,site-per-process,SitePerProcess",
-            "--disable-web-security",
-            "--ignore-certificate-errors",
-            "--ignore-certificate-errors-spki-list",
-            f"--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-        ]
-
-        # Enhanced context parameters
-        context_params = {
-            "viewport": {"width": 1920, "height": 1080},
-            "screen": {"width": 1920, "height": 1080},  # Added screen size
-            "color_scheme": "dark",
-            "locale": "en-AU",
-            "timezone_id": "Australia/Perth",
-            "geolocation": {
-                "latitude": -31.9523,
-                "longitude": 115.8613,
-                "accuracy": 100,
-            },
-            "permissions": ["geolocation", "notifications"],
-            "ignore_https_errors": True,
-            "has_touch": False,
-            "is_mobile": False,
-            "device_scale_factor": 2,
-            "accept_downloads": False,  # Added from ZenRows
-            "java_script_enabled": True,  # Added from ZenRows
-            "bypass_csp": True,  # Added from ZenRows
-        }
-
         try:
             user_data_path = os.path.abspath(self.user_data_dir)
             self.logger.info(f"Using browser profile directory: {user_data_path}")
 
-            # If the user has provided a system Chrome path via env var, prefer that over the bundled browser
-            system_chrome_path = os.environ.get("PLAYWRIGHT_CHROME_PATH")
-            if system_chrome_path and os.path.isfile(system_chrome_path):
-                self.logger.info(f"Using system Chrome executable from PLAYWRIGHT_CHROME_PATH: {system_chrome_path}")
-                browser_kwargs = dict(
-                    executable_path=system_chrome_path,
-                )
-            else:
-                browser_kwargs = {}
-
             # Enhanced stealth scripts from ZenRows
             await self._inject_enhanced_stealth_scripts()
             
@@ -213,9 +289,9 @@ class VisionTwitterExtractor:
             self.browser = await self.playwright.chromium.launch_persistent_context(
                 user_data_dir=user_data_path,
                 headless=self.headless,
-                args=browser_args,
-                **context_params,
-                **browser_kwargs,
+                args=_BROWSER_ARGS,
+                **_CONTEXT_PARAMS,
+                **self._chrome_launch_kwargs(),
             )
             
             if len(self.browser.pages) > 0:
@@ -319,8 +395,10 @@ class VisionTwitterExtractor:
             self.logger.error(f"Error during Twitter login: {e}")
             return False
     
-    async def _extract_tweets_for_handle(self, handle: str) -> List[Dict[str, Any]]:
+    async def _extract_tweets_for_handle(self, handle: str, page: Optional[Page] = None) -> List[Dict[str, Any]]:
         """Extract tweets for a specific Twitter handle."""
+        if page is None:
+            page = self.page
         try:
             self.logger.info(f"Starting tweet extraction for @{handle}")
             tweets = []
@@ -328,7 +406,7 @@ class VisionTwitterExtractor:
             tweets_seen = set()  # To track unique tweet IDs
             
             # Take a screenshot of the profile page
-            screenshot_path = await self._take_screenshot(f"profile_{handle}")
+            screenshot_path = await self._take_screenshot(f"profile_{handle}", page=page)
             
             # Prepare extraction context for OpenAI
             context = self._prepare_extraction_context(handle=handle)
@@ -338,7 +416,7 @@ class VisionTwitterExtractor:
                 self.logger.info(f"Extraction attempt {scroll_attempt}/{max_scroll_attempts}")
                 
                 # Get tweets from current view
-                current_tweets = await self._extract_tweets_from_current_view(handle)
+                current_tweets = await self._extract_tweets_from_current_view(handle, page=page)
                 
                 # Add new unique tweets
                 for tweet in current_tweets:
@@ -354,13 +432,13 @@ class VisionTwitterExtractor:
                     break
                 
                 # Take screenshot for OpenAI
-                screenshot_path = await self._take_screenshot(f"extraction_{handle}_{scroll_attempt}")
+                screenshot_path = await self._take_screenshot(f"extraction_{handle}_{scroll_attempt}", page=page)
                 
                 # Get OpenAI guidance
                 guidance = await self._get_openai_guidance(screenshot_path, context)
                 
                 # Process the response
-                success = await self._process_guidance(guidance, scroll_attempt)
+                success = await self._process_guidance(guidance, scroll_attempt, page=page)
                 if not success:
                     self.logger.warning(f"Action failed in extraction attempt {scroll_attempt}")
                     break
@@ -375,11 +453,13 @@ class VisionTwitterExtractor:
             self.logger.error(f"Error extracting tweets for @{handle}: {e}")
             return []
     
-    async def _extract_tweets_from_current_view(self, handle: str) -> List[Dict[str, Any]]:
+    async def _extract_tweets_from_current_view(self, handle: str, page: Optional[Page] = None) -> List[Dict[str, Any]]:
         """Extract tweets from the current view of the page."""
+        if page is None:
+            page = self.page
         try:
             # Use JavaScript to extract tweets
-            tweets_data = await self.page.evaluate("""(handle) => {
+            tweets_data = await page.evaluate("""(handle) => {
                 const tweets = [];
                 
                 // Find all article elements (tweets)
@@ -491,6 +571,16 @@ Return a JSON response with the following structure:
     async def _get_openai_guidance(self, screenshot_path: str, context: str) -> Dict[str, Any]:
         """Get guidance from OpenAI Vision API."""
         try:
+            # Reuse the guidance for an identical screenshot and prompt if cached
+            cache_path = None
+            if self.screenshot_cache_dir:
+                with open(screenshot_path, "rb") as f:
+                    key = hashlib.sha1(f.read() + context.encode('utf-8')).hexdigest()
+                cache_path = Path(self.screenshot_cache_dir) / f"{key}.json"
+                if cache_path.exists():
+                    self.logger.info(f"Using cached OpenAI guidance for {os.path.basename(screenshot_path)}")
+                    return json.loads(cache_path.read_text(encoding='utf-8'))
+            
             # Ensure the image is of reasonable size
             from PIL import Image
             try:
@@ -515,7 +605,7 @@ Return a JSON response with the following structure:
             
             # Create the OpenAI Chat request
             self.logger.info(f"Sending request to OpenAI API with model: {self.model}")
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {
@@ -564,6 +654,8 @@ Return a JSON response with the following structure:
                     parsed_guidance["can_see_image"] = not cant_see_image
                     
                     self.logger.info(f"OpenAI analysis: {parsed_guidance.get('analysis', '')}")
+                    if cache_path is not None:
+                        cache_path.write_text(json.dumps(parsed_guidance), encoding='utf-8')
                     return parsed_guidance
                 except json.JSONDecodeError as e:
                     self.logger.warning(f"Could not parse JSON from OpenAI response: {e}")
@@ -582,8 +674,10 @@ Return a JSON response with the following structure:
             # Return basic guidance as fallback
             return {"action": "wait", "wait_time": 2000, "can_see_image": False}
     
-    async def _process_guidance(self, guidance: Dict[str, Any], step: int) -> bool:
+    async def _process_guidance(self, guidance: Dict[str, Any], step: int, page: Optional[Page] = None) -> bool:
         """Process guidance from OpenAI to interact with the page."""
+        if page is None:
+            page = self.page
         action = guidance.get("action", "").strip().lower()
         self.logger.info(f"Action: {action}")
         
@@ -613,7 +707,7 @@ Return a JSON response with the following structure:
                 text = guidance.get("text", "").strip()
                 
                 # Debug: Log all input elements on the page
-                debug_elements = await self.page.evaluate("""() => {
+                debug_elements = await page.evaluate("""() => {
                     const inputs = Array.from(document.querySelectorAll('input'));
                     return inputs.map(input => ({
                         placeholder: input.placeholder,
@@ -665,20 +759,20 @@ Return a JSON response with the following structure:
                 masked_cred = cred[:4] + "****" if cred else "[EMPTY]"
                 self.logger.info(f"Attempting to type: '{masked_cred}' into selector: {selector}")
 
-                await self._type_like_human(selector, cred)
+                await self._type_like_human(selector, cred, page=page)
                 
                 # Check if OpenAI suggests clicking a button next or just submitting
                 if guidance.get("next_action") == "click_button":
                     button_selector = guidance.get("button_selector")
                     if button_selector:
                         self.logger.info(f"Clicking button with selector: {button_selector}")
-                        await self.page.click(button_selector)
+                        await page.click(button_selector)
                     else:
                         self.logger.warning("OpenAI suggested clicking button, but no selector provided. Submitting form instead.")
-                        await self.page.press(selector, "Enter")
+                        await page.press(selector, "Enter")
                 else:
                     self.logger.info("Form submitted by pressing Enter")
-                    await self.page.press(selector, "Enter")
+                    await page.press(selector, "Enter")
                 # Indicate the action succeeded so we can continue to next step
                 return True
                 
@@ -730,7 +824,7 @@ Return a JSON response with the following structure:
                 for btn_selector in login_button_selectors:
                     try:
                         self.logger.info(f"Trying to click button with selector: {btn_selector}")
-                        element = await self.page.query_selector(btn_selector)
+                        element = await page.query_selector(btn_selector)
                         if element:
                             # Human-like pre-click pause
                             await asyncio.sleep(random.uniform(0.1, 0.5))
@@ -790,7 +884,7 @@ Return a JSON response with the following structure:
                     }
                     """
                     
-                    js_result = await self.page.evaluate(js_code, js_params)
+                    js_result = await page.evaluate(js_code, js_params)
                     
                     if js_result:
                         self.logger.info(f"Successfully clicked element using JavaScript")
@@ -812,7 +906,7 @@ Return a JSON response with the following structure:
             elif action == "press_key":
                 key = guidance.get("key", "")
                 if key:
-                    await self.page.keyboard.press(key)
+                    await page.keyboard.press(key)
                     return True
                 else:
                     self.logger.warning("Missing key for press_key action")
@@ -821,7 +915,7 @@ Return a JSON response with the following structure:
             elif action == "scroll":
                 direction = guidance.get("direction", "down")
                 distance = guidance.get("distance", 500)
-                return await self._scroll_page(direction, distance)
+                return await self._scroll_page(direction, distance, page=page)
                 
             else:
                 self.logger.warning(f"Unknown action: {action}")
@@ -831,13 +925,15 @@ Return a JSON response with the following structure:
             self.logger.error(f"Error processing guidance: {e}")
             return False
     
-    async def _take_screenshot(self, name: str) -> str:
+    async def _take_screenshot(self, name: str, page: Optional[Page] = None) -> str:
         """Take a screenshot of the current page."""
+        if page is None:
+            page = self.page
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{name}_{timestamp}.png"
         filepath = os.path.join(self.screenshots_dir, filename)
         
-        await self.page.screenshot(path=filepath)
+        await page.screenshot(path=filepath)
         
         self.logger.info(f"Screenshot saved to {filepath}")
         return filepath
@@ -928,8 +1024,10 @@ Return a JSON response with the following structure:
             self.logger.error(f"Error getting page text: {e}")
             return ""
     
-    async def _scroll_page(self, direction: str = "down", distance: int = 500) -> bool:
+    async def _scroll_page(self, direction: str = "down", distance: int = 500, page: Optional[Page] = None) -> bool:
         """Scroll the page."""
+        if page is None:
+            page = self.page
         try:
             if direction.lower() == "up":
                 distance = -abs(distance)
@@ -938,7 +1036,7 @@ Return a JSON response with the following structure:
                 
             actual_distance = distance + random.randint(-50, 50)
             
-            await self.page.evaluate(f"window.scrollBy(0, {actual_distance})")
+            await page.evaluate(f"window.scrollBy(0, {actual_distance})")
             
             await asyncio.sleep(self._random_delay(0.5, 1.5))
             
@@ -1089,8 +1187,10 @@ Pay close attention to the actual HTML structure and DOM elements to provide a s
             self.logger.error(f"Error getting field placeholder: {e}")
             return ""
     
-    async def _type_like_human(self, selector: str, text: str) -> None:
+    async def _type_like_human(self, selector: str, text: str, page: Optional[Page] = None) -> None:
         """Type text in a human-like manner with realistic variations."""
+        if page is None:
+            page = self.page
         try:
             # Base typing speed ranges (in seconds)
             FAST_CHAR_DELAY = (0.01, 0.07)  # Fast typing
@@ -1105,15 +1205,15 @@ Pay close attention to the actual HTML structure and DOM elements to provide a s
                 if random.random() < MISTAKE_PROBABILITY:
                     # Type a wrong character
                     wrong_char = random.choice('qwertyuiopasdfghjklzxcvbnm')
-                    await self.page.type(selector, wrong_char)
+                    await page.type(selector, wrong_char)
                     await asyncio.sleep(random.uniform(0.1, 0.3))
                     
                     # Delete the wrong character
-                    await self.page.keyboard.press('Backspace')
+                    await page.keyboard.press('Backspace')
                     await asyncio.sleep(random.uniform(0.1, 0.2))
                 
                 # Type the correct character
-                await self.page.type(selector, char)
+                await page.type(selector, char)
                 
                 # Determine typing speed based on context
                 if char in '.,!?':
@@ -1140,10 +1240,15 @@ Pay close attention to the actual HTML structure and DOM elements to provide a s
             self.logger.error(f"Error during human-like typing: {e}")
             raise
 
-    async def _inject_enhanced_stealth_scripts(self) -> None:
-        """Inject enhanced stealth scripts based on ZenRows recommendations."""
-        if self.page:
-            await self.page.add_init_script("""
+    async def _inject_enhanced_stealth_scripts(self, target=None) -> None:
+        """
+        Inject enhanced stealth scripts based on ZenRows recommendations.
+        
+        target is a page or context and defaults to the extractor's own page.
+        """
+        target = target or self.page
+        if target:
+            await target.add_init_script("""
                 (() => {
                     // WebGL fingerprint
                     const getParameter = WebGLRenderingContext.prototype.getParameter;
@@ -1233,7 +1338,7 @@ Pay close attention to the actual HTML structure and DOM elements to provide a s
             """)
 
             # Set enhanced headers
-            await self.page.set_extra_http_headers({
+            await target.set_extra_http_headers({
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
                 "Accept-Encoding": "gzip, deflate, br",
                 "Accept-Language": "en-AU,en;q=0.9",
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Process-wide Playwright browser shared by the browser-based test scripts.
+
+Launching Chromium takes seconds while a new context takes milliseconds,
+so the browser is started once on first use and every logical step gets
+its own context instead. Call close_browser() before the event loop
+shuts down.
+"""
+
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+_playwright = None
+_browser = None
+
+async def _get_playwright():
+    global _playwright
+    if _playwright is None:
+        _playwright = await async_playwright().start()
+    return _playwright
+
+async def chromium_installed():
+    """Return whether the Chromium build Playwright expects is on disk"""
+    return Path((await _get_playwright()).chromium.executable_path).exists()
+
+async def get_browser(**launch_kwargs):
+    """
+    Return the shared Chromium browser, launching it on first call.
+
+    launch_kwargs are passed to chromium.launch() and only take effect on
+    the call that actually launches the browser.
+    """
+    global _browser
+    if _browser is None:
+        _browser = await (await _get_playwright()).chromium.launch(**launch_kwargs)
+    return _browser
+
+async def launch_persistent_context(user_data_dir, **context_kwargs):
+    """
+    Launch Chromium with a persistent profile directory.
+
+    The returned context owns its own browser process, so the caller is
+    responsible for closing it.
+    """
+    playwright = await _get_playwright()
+    return await playwright.chromium.launch_persistent_context(user_data_dir, **context_kwargs)
+
+async def close_browser():
+    """Close the shared browser and stop Playwright"""
+    global _playwright, _browser
+    if _browser is not None:
+        await _browser.close()
+        _browser = None
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
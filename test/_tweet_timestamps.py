@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tweet timestamp helpers shared by the tweet-ordering test scripts.
+"""
+
+import sys
+import datetime
+
+import numpy as np
+
+# datetime.fromisoformat() accepts a trailing 'Z' natively from Python 3.11
+_PY311 = sys.version_info >= (3, 11)
+
+def parse_timestamp(timestamp_str):
+    """Parse an ISO 8601 timestamp, converting a 'Z' suffix only where needed"""
+    if not _PY311 and timestamp_str.endswith('Z'):
+        timestamp_str = timestamp_str[:-1] + '+00:00'
+    return datetime.datetime.fromisoformat(timestamp_str)
+
+def is_sorted_newest_first(timestamps):
+    """Check that ISO 8601 timestamps are ordered newest to oldest"""
+    if len(timestamps) < 2:
+        return True
+
+    # Same-length strings with the same timezone suffix sort lexicographically
+    # in time order, so they can be compared as raw bytes without parsing
+    width = len(timestamps[0])
+    suffix = 'Z' if timestamps[0].endswith('Z') else timestamps[0][-6:]
+    if all(len(ts) == width and ts.endswith(suffix) for ts in timestamps):
+        arr = np.array(timestamps, dtype=f'S{width}')
+        return bool(np.all(arr[:-1] >= arr[1:]))
+
+    # Non-ISO values raise ValueError and naive/aware mixes raise TypeError;
+    # fall back to the plain string comparison rather than failing the report
+    try:
+        dates = [parse_timestamp(ts) for ts in timestamps]
+        return dates == sorted(dates, reverse=True)
+    except (ValueError, TypeError):
+        return timestamps == sorted(timestamps, reverse=True)
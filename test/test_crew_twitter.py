@@ -10,7 +10,9 @@ from pathlib import Path
 from datetime import datetime
 
 # Add parent directory to Python path
-sys.path.append(str(Path(__file__).parent.parent))
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 # Set up logging
 logging.basicConfig(
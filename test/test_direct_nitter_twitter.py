@@ -16,7 +16,9 @@ from datetime import datetime
 from pathlib import Path
 
 # Add project root to Python path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from etl.extract.direct_nitter_twitter_extractor import DirectNitterTwitterExtractor
 from etl.transform.twitter_sentiment_transformer import TwitterSentimentTransformer
@@ -12,7 +12,9 @@ from datetime import datetime
 from dotenv import load_dotenv
 
 # Add the parent directory to the Python path
-sys.path.append(str(Path(__file__).parent.parent))
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 # Set up logging
 logging.basicConfig(
@@ -11,10 +11,13 @@ from pathlib import Path
 from typing import Dict, Any, List
 
 # Add parent directory to path to allow importing modules from the project
-sys.path.insert(0, str(Path(__file__).parent.parent))
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from dotenv import load_dotenv
 from etl.extract.twitter_influencers_extractor import TwitterInfluencersExtractor
+from _tweet_timestamps import parse_timestamp, is_sorted_newest_first
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
@@ -26,7 +29,7 @@ def format_timestamp(timestamp_str):
         return "Unknown date"
     
     try:
-        dt = datetime.datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        dt = parse_timestamp(timestamp_str)
         # Format as "12 Apr 2025 14:30"
         return dt.strftime("%d %b %Y %H:%M")
     except Exception as e:
@@ -44,7 +47,7 @@ def analyze_tweet_dates(tweets):
         timestamp = tweet.get("timestamp")
         if timestamp:
             try:
-                dt = datetime.datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                dt = parse_timestamp(timestamp)
                 dates.append(dt)
             except Exception as e:
                 logger.warning(f"Error parsing timestamp '{timestamp}': {e}")
@@ -122,7 +125,7 @@ def main():
             # Check if tweets are sorted
             timestamps = [t.get('timestamp') for t in tweets if t.get('timestamp')]
             if timestamps:
-                is_sorted = all(timestamps[i] >= timestamps[i+1] for i in range(len(timestamps)-1))
+                is_sorted = is_sorted_newest_first(timestamps)
                 logger.info(f"Tweets are sorted by timestamp: {is_sorted}")
                 
                 # Most recent and oldest tweet
@@ -172,7 +175,7 @@ def main():
             # Check if tweets are sorted
             timestamps = [t.get('timestamp') for t in tweets if t.get('timestamp')]
             if timestamps:
-                is_sorted = all(timestamps[i] >= timestamps[i+1] for i in range(len(timestamps)-1))
+                is_sorted = is_sorted_newest_first(timestamps)
                 logger.info(f"Tweets are sorted by timestamp: {is_sorted}")
                 
                 # Most recent and oldest tweet
@@ -218,8 +221,8 @@ def main():
             
             # Try to parse and compare dates
             try:
-                twitter_dt = datetime.datetime.fromisoformat(max(twitter_timestamps).replace('Z', '+00:00'))
-                nitter_dt = datetime.datetime.fromisoformat(max(nitter_timestamps).replace('Z', '+00:00'))
+                twitter_dt = parse_timestamp(max(twitter_timestamps))
+                nitter_dt = parse_timestamp(max(nitter_timestamps))
                 
                 if twitter_dt > nitter_dt:
                     logger.info("Regular Twitter has more recent tweets")
@@ -11,7 +11,8 @@ import sys
 # If running pytest from the project root, this might not be strictly needed, 
 # but it helps ensure robustness.
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.insert(0, project_root)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 # Load environment variables from .env file in the project root
 dotenv_path = os.path.join(project_root, '.env')
@@ -16,7 +16,9 @@ import logging
 from pathlib import Path
 
 # Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from etl.transform.openai_sentiment_transformer import OpenAISentimentTransformer
 from utils.logging_config import setup_logging
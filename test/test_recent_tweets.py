@@ -4,39 +4,279 @@ Test script for extracting the most recent tweets using Crawlbase API
 """
 
 import os
+import re
 import sys
 import logging
-import requests
+import asyncio
+import aiohttp
+import soupsieve as sv
 import json
 import datetime
+import functools
 import time
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from urllib.parse import quote, urlparse
+from bs4 import BeautifulSoup, SoupStrainer, FeatureNotFound, ParserRejectedMarkup
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
 # Add project root to Python path to allow imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Only build the parts of the page that can contain tweets
+_ARTICLE_STRAINER = SoupStrainer('article')
+# Every mobile container selector targets a <div>, so one strainer covers them all
+_MOBILE_DIV_STRAINER = SoupStrainer('div')
+
+# CSS selectors compiled once and reused for every page and tweet
+_ARTICLE_SELECTORS = (sv.compile('article[data-testid="tweet"]'), sv.compile('article'))
+_MOBILE_CONTAINER_SELECTORS = (
+    sv.compile('div.tweet'),
+    sv.compile('div.timeline-tweet'),
+    sv.compile('div[data-testid="tweet"]'),
+)
+_MOBILE_CONTENT_SELECTORS = (
+    sv.compile('div.tweet-text'),
+    sv.compile('p.tweet-text'),
+    sv.compile('div[data-testid="tweetText"]'),
+)
+_TIME_SELECTOR = sv.compile('time')
+_STATUS_ID_RE = re.compile(r'/status/(\d+)')
+
+# Engagement metric data-testid values and the keys they are stored under
+_METRIC_TESTIDS = {'like': 'likes', 'retweet': 'retweets', 'reply': 'replies'}
+
+# Maximum number of handles fetched from Crawlbase at the same time
+MAX_CONCURRENT_HANDLES = 5
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=45)
+
+# Connection pool shared by every request; keep-alive avoids a new TLS
+# handshake with api.crawlbase.com per request
+POOL_SIZE = 16
+DNS_CACHE_TTL = 300
+
+# URL-encode a whole URL so it can be passed as a Crawlbase query parameter
+_urlquote = functools.partial(quote, safe='')
+
+# Crawlbase API URL for the desktop profile page:
+# 1. JavaScript rendering enabled (required for Twitter's dynamic content)
+# 2. Use desktop user agent
+# 3. Set higher timeout (30 seconds) to allow the page to fully load
+# 4. Set cache to false to ensure we get the latest data
+_PROFILE_API_URL = ("https://api.crawlbase.com/?token={token}&url={url}"
+                    "&javascript=true&timeout=30000&cache=false")
+
+# Crawlbase API URL for the mobile profile page, with a mobile user agent
+_MOBILE_API_URL = ("https://api.crawlbase.com/?token={token}&url={url}&javascript=true&timeout=30000"
+                   "&user_agent=Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1")
+
+# Minimum number of seconds between two requests to the same host
+MIN_REQUEST_INTERVAL = 1.5
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Raw HTML is only written to debug_output/ when TWEET_DEBUG_DUMP=1
+DEBUG_DUMP = os.environ.get("TWEET_DEBUG_DUMP") == "1"
+DEBUG_DUMP_BUFFER_SIZE = 1024 * 1024
+
+# Parsed tweets are cached on disk per handle and day so repeat runs skip
+# the Crawlbase round trip; set TWEET_CACHE_TTL=0 to disable
+TWEET_CACHE_DIR = ".tweet_cache"
+TWEET_CACHE_TTL = int(os.environ.get("TWEET_CACHE_TTL", "3600"))
+
+class DomainLimiter:
+    """Space out requests to the same host while letting other hosts proceed"""
+    
+    def __init__(self, delay=MIN_REQUEST_INTERVAL):
+        self._delay = delay
+        self._last = {}
+        self._locks = {}
+    
+    async def wait(self, host):
+        """Wait only for whatever remains of the delay since the last request to host"""
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            elapsed = time.monotonic() - self._last.get(host, 0)
+            if elapsed < self._delay:
+                await asyncio.sleep(self._delay - elapsed)
+            self._last[host] = time.monotonic()
+
+def select_first(node, selectors):
+    """Return the matches of the first selector that finds anything"""
+    for selector in selectors:
+        matches = selector.select(node)
+        if matches:
+            return matches
+    return []
+
+# Precompiled pattern for the date and time fields used by format_timestamp
+_TIMESTAMP_RE = re.compile(r'(\d{4})-(0[1-9]|1[0-2])-(\d{2})T(\d{2}):(\d{2})')
+_MONTH_ABBR = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
 
 def format_timestamp(timestamp_str):
     """Format a timestamp string to be more readable"""
     if not timestamp_str:
         return "Unknown date"
     
-    try:
-        dt = datetime.datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        # Format as "1 Jan 2023 14:30"
-        return dt.strftime("%d %b %Y %H:%M")
-    except:
+    match = _TIMESTAMP_RE.match(timestamp_str)
+    if not match:
         return timestamp_str
+    
+    # Format as "01 Jan 2023 14:30"
+    year, month, day, hour, minute = match.groups()
+    return f"{day} {_MONTH_ABBR[int(month) - 1]} {year} {hour}:{minute}"
+
+def _tweet_cache_path(username, count):
+    """Return the cache file for a handle, tweet count and today's date"""
+    bucket = datetime.date.today().isoformat()
+    return os.path.join(TWEET_CACHE_DIR, f"{username}_{bucket}_{count}.json")
+
+def load_cached_tweets(username, count):
+    """Return cached tweets for a handle, or None if there is no fresh entry"""
+    if TWEET_CACHE_TTL <= 0:
+        return None
+    
+    cache_file = _tweet_cache_path(username, count)
+    try:
+        if time.time() - os.path.getmtime(cache_file) > TWEET_CACHE_TTL:
+            return None
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_cached_tweets(username, count, tweets):
+    """Store parsed tweets for a handle in the on-disk cache"""
+    if TWEET_CACHE_TTL <= 0:
+        return
+    
+    try:
+        os.makedirs(TWEET_CACHE_DIR, exist_ok=True)
+        with open(_tweet_cache_path(username, count), "w", encoding="utf-8") as f:
+            json.dump(tweets, f)
+    except OSError as e:
+        logger.warning(f"Could not cache tweets for @{username}: {e}")
+
+async def read_body(response, debug_file=None):
+    """Read a response body in chunks, copying each chunk to debug_file as it arrives"""
+    if not debug_file:
+        return await response.read()
+    
+    body = bytearray()
+    with open(debug_file, "wb", buffering=DEBUG_DUMP_BUFFER_SIZE) as f:
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            f.write(chunk)
+            body.extend(chunk)
+    return bytes(body)
+
+class Tweet:
+    """A single extracted tweet, slotted to keep per-tweet memory small"""
+    # Hand-written __slots__ because dataclass(slots=True) needs Python 3.10+
+    __slots__ = ("user", "extract_time", "content", "timestamp",
+                 "formatted_time", "id", "url", "metrics")
+    
+    def __init__(self, user: str, extract_time: str = "", content: str = "",
+                 timestamp: Optional[str] = None, formatted_time: Optional[str] = None,
+                 id: Optional[str] = None, url: Optional[str] = None,
+                 metrics: Optional[dict] = None):
+        self.user = user
+        self.extract_time = extract_time
+        self.content = content
+        self.timestamp = timestamp
+        self.formatted_time = formatted_time
+        self.id = id
+        self.url = url
+        self.metrics = metrics if metrics is not None else {}
+    
+    def to_dict(self):
+        """Return the tweet as a dict, leaving out fields that were not found"""
+        return {name: getattr(self, name) for name in self.__slots__
+                if getattr(self, name) is not None}
+
+def parse_tweets_html(html, username, count):
+    """
+    Extract tweets from a rendered Twitter profile page
+    
+    This is CPU-bound and runs in a worker process, so it only takes and
+    returns picklable values.
+    """
+    # Parse the HTML with lxml's C parser, falling back to the pure-Python
+    # parser if lxml is unavailable, rejects the markup or finds nothing
+    try:
+        soup = BeautifulSoup(html, 'lxml', parse_only=_ARTICLE_STRAINER)
+        articles = select_first(soup, _ARTICLE_SELECTORS)
+    except (FeatureNotFound, ParserRejectedMarkup):
+        articles = []
+    
+    # Find all article elements (tweets)
+    if not articles:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=_ARTICLE_STRAINER)
+        articles = select_first(soup, _ARTICLE_SELECTORS)
+    logger.info(f"Found {len(articles)} potential tweets")
+    
+    # Extract tweet data
+    tweets = []
+    for article in articles[:count]:
+        # Initialize empty tweet
+        tweet = Tweet(user=username, extract_time=datetime.datetime.now().isoformat())
+        
+        # Extract tweet text
+        text_element = article.find('div', attrs={'data-testid': 'tweetText'})
+        if text_element:
+            tweet.content = text_element.get_text(separator=' ', strip=True)
+        else:
+            # Try alternative selectors
+            lang_divs = article.find_all('div', attrs={'lang': True})
+            tweet.content = ' '.join([div.get_text(strip=True) for div in lang_divs])
+        
+        # Extract tweet ID and timestamp
+        time_element = article.find('time')
+        links = article.find_all('a', href=True)
+        
+        if time_element:
+            tweet.timestamp = time_element.get('datetime')
+            tweet.formatted_time = format_timestamp(tweet.timestamp)
+        
+        for link in links:
+            match = _STATUS_ID_RE.search(link['href'])
+            if match:
+                tweet.id = match.group(1)
+                tweet.url = f"https://twitter.com/{username}/status/{tweet.id}"
+                break
+        
+        # Extract engagement metrics in a single walk over the article,
+        # using the first element found for each metric
+        metrics = tweet.metrics
+        seen_testids = set()
+        for node in article.find_all('div', attrs={'data-testid': True}):
+            testid = node['data-testid']
+            if testid not in _METRIC_TESTIDS or testid in seen_testids:
+                continue
+            seen_testids.add(testid)
+            
+            # Skip the bare button label, e.g. "Like" when there are no likes
+            metric_text = node.get_text(strip=True)
+            if metric_text and metric_text.lower() != testid:
+                metrics[_METRIC_TESTIDS[testid]] = metric_text
+        
+        # Add to tweets list
+        tweets.append(tweet)
+    
+    return [tweet.to_dict() for tweet in tweets]
 
-def get_recent_tweets(username, token, count=10):
+async def get_recent_tweets(session, process_pool, limiter, username, token, count=10):
     """
     Get the most recent tweets from a user profile
     
     Args:
+        session: Shared aiohttp client session
+        process_pool: Executor used to parse the HTML
+        limiter: DomainLimiter shared by all requests
         username: Twitter handle without @ symbol
         token: Crawlbase API token
         count: Maximum number of tweets to extract
@@ -46,112 +286,62 @@ def get_recent_tweets(username, token, count=10):
     """
     logger.info(f"Attempting to get {count} recent tweets from @{username}...")
     
+    cached_tweets = load_cached_tweets(username, count)
+    if cached_tweets is not None:
+        logger.info(f"Using {len(cached_tweets)} cached tweets for @{username}")
+        return cached_tweets
+    
     # Use Twitter's actual URL structure
     url = f"https://twitter.com/{username}"
     
-    # Encode the URL for Crawlbase
-    encoded_url = requests.utils.quote(url, safe='')
-    
-    # Construct the Crawlbase API URL with several enhancements:
-    # 1. JavaScript rendering enabled (required for Twitter's dynamic content)
-    # 2. Use desktop user agent
-    # 3. Set higher timeout (30 seconds) to allow the page to fully load
-    # 4. Set cache to false to ensure we get the latest data
-    api_url = f"https://api.crawlbase.com/?token={token}&url={encoded_url}&javascript=true&timeout=30000&cache=false"
+    # Construct the Crawlbase API URL
+    api_url = _PROFILE_API_URL.format_map({"token": token, "url": _urlquote(url)})
     
     # Hide token in logs
     safe_url = api_url.replace(token, f"{token[:4]}...{token[-4:]}")
     logger.info(f"Making request to: {safe_url}")
     
     try:
+        # Optionally save the HTML for debugging while it is being downloaded
+        debug_file = None
+        if DEBUG_DUMP:
+            output_dir = "debug_output"
+            os.makedirs(output_dir, exist_ok=True)
+            debug_file = os.path.join(output_dir, f"{username}_twitter_page.html")
+        
         # Send the request
         logger.info("Sending request (this may take up to 30 seconds)...")
-        response = requests.get(api_url)
-        
-        if response.status_code != 200:
-            logger.error(f"Request failed with status code {response.status_code}")
-            return []
-        
-        logger.info(f"Response received! Size: {len(response.text)} bytes")
+        await limiter.wait(urlparse(api_url).netloc)
+        async with session.get(api_url, timeout=REQUEST_TIMEOUT) as response:
+            if response.status != 200:
+                logger.error(f"Request failed with status code {response.status}")
+                return []
+            
+            html = await read_body(response, debug_file)
         
-        # Save the HTML for debugging
-        output_dir = "debug_output"
-        os.makedirs(output_dir, exist_ok=True)
-        debug_file = os.path.join(output_dir, f"{username}_twitter_page.html")
-        with open(debug_file, "w", encoding="utf-8") as f:
-            f.write(response.text)
-        logger.info(f"Saved HTML to {debug_file}")
+        logger.info(f"Response received! Size: {len(html)} bytes")
+        if debug_file:
+            logger.info(f"Saved HTML to {debug_file}")
         
-        # Parse the HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Error and challenge pages carry no tweet markup, so skip parsing them
+        if b'data-testid="tweet"' not in html and b'tweetText' not in html:
+            logger.warning("No tweet markers in response, skipping parse")
+            return []
         
-        # Find all article elements (tweets)
-        articles = soup.select('article[data-testid="tweet"]') or soup.select('article')
-        logger.info(f"Found {len(articles)} potential tweets")
+        # Parse in a worker process so parsing pages for other handles
+        # is not serialized behind the GIL
+        loop = asyncio.get_running_loop()
+        tweets = await loop.run_in_executor(process_pool, parse_tweets_html, html, username, count)
+        if tweets:
+            save_cached_tweets(username, count, tweets)
         
-        # Extract tweet data
-        tweets = []
-        for i, article in enumerate(articles[:count]):
-            # Initialize empty tweet
-            tweet = {
-                "user": username,
-                "extract_time": datetime.datetime.now().isoformat()
-            }
-            
-            # Extract tweet text
-            text_elements = article.select('div[data-testid="tweetText"]')
-            if text_elements:
-                tweet["content"] = text_elements[0].get_text(separator=' ', strip=True)
-            else:
-                # Try alternative selectors
-                lang_divs = article.select('div[lang]')
-                tweet["content"] = ' '.join([div.get_text(strip=True) for div in lang_divs])
-            
-            # Extract tweet ID and timestamp
-            time_elements = article.select('time')
-            links = article.select('a[href*="/status/"]')
-            
-            if time_elements:
-                timestamp = time_elements[0].get('datetime')
-                tweet["timestamp"] = timestamp
-                tweet["formatted_time"] = format_timestamp(timestamp)
-            
-            for link in links:
-                href = link.get('href', '')
-                if '/status/' in href:
-                    tweet_id = href.split('/status/')[1].split('/')[0]
-                    tweet["id"] = tweet_id
-                    tweet["url"] = f"https://twitter.com/{username}/status/{tweet_id}"
-                    break
-            
-            # Extract engagement metrics
-            metrics = {}
-            
-            # Look for like count
-            like_elements = article.select('div[data-testid="like"]')
-            if like_elements:
-                like_text = like_elements[0].get_text(strip=True)
-                if like_text and like_text.lower() != 'like':
-                    metrics["likes"] = like_text
-            
-            # Look for retweets
-            retweet_elements = article.select('div[data-testid="retweet"]')
-            if retweet_elements:
-                retweet_text = retweet_elements[0].get_text(strip=True)
-                if retweet_text and retweet_text.lower() != 'retweet':
-                    metrics["retweets"] = retweet_text
-            
-            tweet["metrics"] = metrics
-            
-            # Add to tweets list
-            tweets.append(tweet)
-            
-            # Log the tweet for debugging
-            logger.info(f"Tweet {i+1}:")
-            logger.info(f"  Date: {tweet.get('formatted_time', 'Unknown')}")
-            logger.info(f"  Content: {tweet.get('content', 'No content')[:100]}..." if len(tweet.get('content', '')) > 100 else f"  Content: {tweet.get('content', 'No content')}")
-            logger.info(f"  URL: {tweet.get('url', 'No URL')}")
-            logger.info("  ---")
+        # Log the tweets for debugging as a single record
+        if logger.isEnabledFor(logging.DEBUG):
+            summary_lines = [
+                f"#{i+1} {tweet.get('formatted_time', 'Unknown')}: {tweet.get('content', '')[:100]} ({tweet.get('url', 'No URL')})"
+                for i, tweet in enumerate(tweets)
+            ]
+            logger.debug("Extracted tweets:\n%s", "\n".join(summary_lines))
         
         # Calculate age of newest tweet
         if tweets and any(t.get('timestamp') for t in tweets):
@@ -175,69 +365,74 @@ def get_recent_tweets(username, token, count=10):
         logger.error(f"Error getting recent tweets: {e}")
         return []
 
-def try_mobile_approach(username, token, count=10):
+async def try_mobile_approach(session, limiter, username, token, count=10):
     """Try using the mobile version of Twitter which might show more recent tweets"""
     logger.info(f"Trying mobile approach for @{username}...")
     
     # Use mobile Twitter URL
     url = f"https://mobile.twitter.com/{username}"
     
-    # Encode the URL
-    encoded_url = requests.utils.quote(url, safe='')
-    
     # Construct API URL with mobile user agent
-    api_url = (f"https://api.crawlbase.com/?token={token}&url={encoded_url}&javascript=true&timeout=30000"
-               f"&user_agent=Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1")
+    api_url = _MOBILE_API_URL.format_map({"token": token, "url": _urlquote(url)})
     
     # Make request
     try:
-        logger.info("Sending mobile request...")
-        response = requests.get(api_url)
+        # Optionally save the response for debugging while it is being downloaded
+        mobile_file = None
+        if DEBUG_DUMP:
+            output_dir = "debug_output"
+            os.makedirs(output_dir, exist_ok=True)
+            mobile_file = os.path.join(output_dir, f"{username}_mobile.html")
         
-        if response.status_code != 200:
-            logger.error(f"Mobile request failed with status {response.status_code}")
-            return []
+        logger.info("Sending mobile request...")
+        await limiter.wait(urlparse(api_url).netloc)
+        async with session.get(api_url, timeout=REQUEST_TIMEOUT) as response:
+            if response.status != 200:
+                logger.error(f"Mobile request failed with status {response.status}")
+                return []
+            
+            html = await read_body(response, mobile_file)
         
-        # Save response for debugging
-        output_dir = "debug_output"
-        os.makedirs(output_dir, exist_ok=True)
-        mobile_file = os.path.join(output_dir, f"{username}_mobile.html")
-        with open(mobile_file, "w", encoding="utf-8") as f:
-            f.write(response.text)
-        logger.info(f"Saved mobile HTML to {mobile_file}")
+        if mobile_file:
+            logger.info(f"Saved mobile HTML to {mobile_file}")
         
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Parse only the <div> elements once with lxml; html.parser is only
+        # used when lxml is not installed or rejects the markup
+        try:
+            soup = BeautifulSoup(html, 'lxml', parse_only=_MOBILE_DIV_STRAINER)
+        except (FeatureNotFound, ParserRejectedMarkup):
+            soup = BeautifulSoup(html, 'html.parser', parse_only=_MOBILE_DIV_STRAINER)
         
         # Try various mobile-specific selectors
-        tweet_containers = (soup.select('div.tweet') or 
-                            soup.select('div.timeline-tweet') or
-                            soup.select('div[data-testid="tweet"]'))
+        tweet_containers = select_first(soup, _MOBILE_CONTAINER_SELECTORS)
         
         logger.info(f"Found {len(tweet_containers)} potential mobile tweets")
         
         # Extract basic info
         tweets = []
-        for i, container in enumerate(tweet_containers[:count]):
+        for container in tweet_containers[:count]:
             tweet = {"user": username, "source": "mobile"}
             
             # Extract content
-            content_elements = (container.select('div.tweet-text') or 
-                                container.select('p.tweet-text') or
-                                container.select('div[data-testid="tweetText"]'))
+            content_elements = select_first(container, _MOBILE_CONTENT_SELECTORS)
             
             if content_elements:
                 tweet["content"] = content_elements[0].get_text(strip=True)
             
             # Extract timestamp
-            time_elements = container.select('time')
-            if time_elements:
-                tweet["timestamp"] = time_elements[0].get('datetime')
+            time_element = _TIME_SELECTOR.select_one(container)
+            if time_element:
+                tweet["timestamp"] = time_element.get('datetime')
             
             tweets.append(tweet)
-            
-            # Log for debugging
-            logger.info(f"Mobile Tweet {i+1}: {tweet.get('content', 'No content')[:50]}...")
+        
+        # Log for debugging as a single record
+        if logger.isEnabledFor(logging.DEBUG):
+            summary_lines = [
+                f"#{i+1} {tweet.get('content', 'No content')[:50]}"
+                for i, tweet in enumerate(tweets)
+            ]
+            logger.debug("Extracted mobile tweets:\n%s", "\n".join(summary_lines))
         
         return tweets
         
@@ -245,8 +440,33 @@ def try_mobile_approach(username, token, count=10):
         logger.error(f"Error in mobile approach: {e}")
         return []
 
+async def process_handle(session, process_pool, semaphore, limiter, username, token):
+    """Run the regular and mobile approaches for a single handle"""
+    async with semaphore:
+        logger.info(f"TESTING WITH @{username}")
+        
+        # Try regular approach
+        tweets = await get_recent_tweets(session, process_pool, limiter, username, token, count=5)
+        
+        # Try mobile approach
+        mobile_tweets = await try_mobile_approach(session, limiter, username, token, count=5)
+    
+    return tweets, mobile_tweets
+
+async def run_handles(handles, token):
+    """Fetch all handles concurrently over a shared HTTP session"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_HANDLES)
+    limiter = DomainLimiter()
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as process_pool:
+        connector = aiohttp.TCPConnector(limit=POOL_SIZE, ttl_dns_cache=DNS_CACHE_TTL)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [process_handle(session, process_pool, semaphore, limiter, username, token)
+                     for username in handles]
+            return await asyncio.gather(*tasks)
+
 def main():
-    # Load environment variables
+    # Load environment variables (imported here as only main() needs it)
+    from dotenv import load_dotenv
     load_dotenv()
     
     # Crawlbase API token
@@ -255,25 +475,15 @@ def main():
     # Twitter handles to test
     handles = ["matt_willemsen", "karpathy", "naval"]
     
-    for username in handles:
+    results = asyncio.run(run_handles(handles, token))
+    
+    for username, (tweets, mobile_tweets) in zip(handles, results):
         logger.info(f"=" * 60)
-        logger.info(f"TESTING WITH @{username}")
+        logger.info(f"RESULTS FOR @{username}")
         logger.info(f"=" * 60)
-        
-        # Try regular approach
-        tweets = get_recent_tweets(username, token, count=5)
         logger.info(f"Regular approach extracted {len(tweets)} tweets")
-        
-        # Try mobile approach
-        mobile_tweets = try_mobile_approach(username, token, count=5)
         logger.info(f"Mobile approach extracted {len(mobile_tweets)} tweets")
-        
-        # Wait between users to avoid rate limiting
-        if username != handles[-1]:
-            logger.info("Waiting 5 seconds before the next user...")
-            time.sleep(5)
-        
         logger.info("\n")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -4,6 +4,7 @@ Test script to verify that we properly extract and sort tweets by timestamp.
 """
 
 import os
+import re
 import sys
 import logging
 import json
@@ -11,81 +12,108 @@ import datetime
 from pathlib import Path
 from typing import Dict, Any, List
 
+import numpy as np
+
 # Add parent directory to path to allow importing modules from the project
-sys.path.insert(0, str(Path(__file__).parent.parent))
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-from dotenv import load_dotenv
 from etl.extract.twitter_influencers_extractor import TwitterInfluencersExtractor
+from _tweet_timestamps import parse_timestamp, is_sorted_newest_first
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
+# Precompiled pattern for the date and time fields used by format_timestamp
+_TIMESTAMP_RE = re.compile(r'(\d{4})-(0[1-9]|1[0-2])-(\d{2})T(\d{2}):(\d{2})')
+_MONTH_ABBR = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
 def format_timestamp(timestamp_str):
     """Format a timestamp string to be more readable"""
     if not timestamp_str:
         return "Unknown date"
     
-    try:
-        dt = datetime.datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        # Format as "12 Apr 2025 14:30"
-        return dt.strftime("%d %b %Y %H:%M")
-    except Exception as e:
-        logger.warning(f"Error formatting timestamp '{timestamp_str}': {e}")
+    match = _TIMESTAMP_RE.match(timestamp_str)
+    if not match:
         return timestamp_str
+    
+    # Format as "12 Apr 2025 14:30"
+    year, month, day, hour, minute = match.groups()
+    return f"{day} {_MONTH_ABBR[int(month) - 1]} {year} {hour}:{minute}"
+
+def to_datetime64(timestamps):
+    """Convert ISO 8601 timestamps to a numpy datetime64[s] array in UTC, dropping invalid ones"""
+    # numpy only parses naive ISO strings, so the UTC 'Z' suffix is dropped
+    # and any other offset is normalised to UTC through datetime first
+    values = []
+    for timestamp in timestamps:
+        if timestamp.endswith('Z'):
+            values.append(timestamp[:-1])
+            continue
+        try:
+            dt = parse_timestamp(timestamp).astimezone(datetime.timezone.utc)
+            values.append(dt.replace(tzinfo=None).isoformat())
+        except ValueError:
+            pass
+    
+    try:
+        return np.array(values, dtype='datetime64[s]')
+    except ValueError:
+        # Fall back to converting one at a time so a bad value is skipped
+        dates = []
+        for value in values:
+            try:
+                dates.append(np.datetime64(value, 's'))
+            except ValueError:
+                pass
+        return np.array(dates, dtype='datetime64[s]')
 
 def analyze_tweet_dates(tweets):
     """Analyze the distribution of tweet dates"""
     if not tweets:
         return "No tweets to analyze"
     
-    # Convert timestamps to datetime objects
-    dates = []
-    for tweet in tweets:
-        timestamp = tweet.get("timestamp")
-        if timestamp:
-            try:
-                dt = datetime.datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                dates.append(dt)
-            except:
-                pass
+    # Convert all timestamps in one pass
+    dates = to_datetime64([tweet["timestamp"] for tweet in tweets if tweet.get("timestamp")])
     
-    if not dates:
+    if not dates.size:
         return "No valid dates found"
     
     # Sort dates newest to oldest
-    dates.sort(reverse=True)
+    dates.sort()
+    dates = dates[::-1]
     
     # Calculate some statistics
-    now = datetime.datetime.now(dates[0].tzinfo)
-    newest_age = now - dates[0]
-    oldest_age = now - dates[-1]
+    now = np.datetime64('now', 's')
+    newest_age = (now - dates[0]).astype('timedelta64[D]').astype(int)
+    oldest_age = (now - dates[-1]).astype('timedelta64[D]').astype(int)
     
-    # Group by year-month
-    months = {}
-    for dt in dates:
-        key = dt.strftime("%Y-%m")
-        months[key] = months.get(key, 0) + 1
+    # Group by month
+    months, counts = np.unique(dates.astype('datetime64[M]'), return_counts=True)
     
-    # Sort months
-    sorted_months = sorted(months.items(), reverse=True)
+    # Only the summary rows are converted back to Python datetimes for formatting
+    newest = dates[0].astype(datetime.datetime)
+    oldest = dates[-1].astype(datetime.datetime)
     
     result = []
-    result.append(f"Date range: {dates[-1].strftime('%d %b %Y')} to {dates[0].strftime('%d %b %Y')}")
-    result.append(f"Newest tweet: {dates[0].strftime('%d %b %Y %H:%M')} ({newest_age.days} days old)")
-    result.append(f"Oldest tweet: {dates[-1].strftime('%d %b %Y %H:%M')} ({oldest_age.days} days old)")
+    result.append(f"Date range: {oldest.strftime('%d %b %Y')} to {newest.strftime('%d %b %Y')}")
+    result.append(f"Newest tweet: {newest.strftime('%d %b %Y %H:%M')} ({newest_age} days old)")
+    result.append(f"Oldest tweet: {oldest.strftime('%d %b %Y %H:%M')} ({oldest_age} days old)")
     result.append(f"Distribution by month:")
     
-    for month, count in sorted_months:
-        year, month_num = month.split("-")
-        month_name = datetime.datetime(int(year), int(month_num), 1).strftime("%b %Y")
+    for month, count in zip(months[::-1], counts[::-1]):
+        month_name = month.astype(datetime.date).strftime("%b %Y")
         result.append(f"  {month_name}: {count} tweets")
     
     return "\n".join(result)
 
 def main():
     """Test the Twitter influencers extractor with proper sorting"""
-    # Load environment variables
+    # Load environment variables (imported here as only main() needs it)
+    from dotenv import load_dotenv
     load_dotenv()
     
     # Use the JavaScript token 
@@ -135,7 +163,7 @@ def main():
         ]
         
         if timestamps:
-            is_sorted = all(timestamps[i] >= timestamps[i+1] for i in range(len(timestamps)-1))
+            is_sorted = is_sorted_newest_first(timestamps)
             logger.info(f"Tweets are sorted by timestamp: {is_sorted}")
             
             # Show the most recent and oldest tweet dates
@@ -10,7 +10,9 @@ import os
 from pathlib import Path
 
 # Add parent directory to path to allow importing modules from the project
-sys.path.insert(0, str(Path(__file__).parent.parent))
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from dotenv import load_dotenv
 from etl.extract.twitter_influencers_extractor import TwitterInfluencersExtractor
@@ -10,12 +10,14 @@ from specific Twitter handles by logging in with valid credentials.
 
 import os
 import sys
-import json
 import logging
+import orjson
 from datetime import datetime
 
 # Add parent directory to path to import from etl module
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from etl.extract.twitter_login_extractor import TwitterLoginExtractor
 from etl.utils.logging_config import setup_logging
@@ -90,8 +92,8 @@ def main():
     current_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = os.path.join(output_dir, f"twitter_login_results_{current_timestamp}.json")
     
-    with open(output_file, "w") as f:
-        json.dump(result, f, indent=2)
+    with open(output_file, "wb") as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str))
     
     logger.info(f"Results saved to {output_file}")
 
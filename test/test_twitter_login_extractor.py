@@ -10,15 +10,17 @@ It requires valid Twitter credentials to run properly.
 
 import os
 import sys
-import json
 import time
+import orjson
 import logging
 import argparse
 from dotenv import load_dotenv
 from pathlib import Path
 
 # Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from etl.extract.twitter_login_extractor import TwitterLoginExtractor
 from utils.logging_config import setup_logging
@@ -128,8 +130,8 @@ def main():
     
     # Save results to file
     if output_file:
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str))
         logger.info(f"Results saved to {output_file}")
     
     # Print sample tweet if available
@@ -8,58 +8,77 @@ capabilities to guide Playwright browser automation.
 
 import os
 import sys
-import json
 import logging
+import functools
 import argparse
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Add project root to path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.insert(0, project_root)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
+def build_parser():
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(description="Test Twitter extraction using OpenAI vision")
+    
+    # Twitter credentials
+    parser.add_argument("--username", type=str, help="Twitter username")
+    parser.add_argument("--email", type=str, help="Twitter email")
+    parser.add_argument("--password", type=str, help="Twitter password")
+    parser.add_argument("--verification_code", type=str, help="Verification code (if needed)")
+    
+    # Extraction parameters
+    parser.add_argument("--handles", type=str, nargs="+", help="List of Twitter handles to extract")
+    parser.add_argument("--max_tweets", type=int, default=10, help="Maximum tweets per handle")
+    parser.add_argument("--headless", action="store_true", default=False, help="Run in headless mode")
+    parser.add_argument("--no-headless", dest="headless", action="store_false", help="Run with visible browser")
+    parser.add_argument("--output_file", type=str, help="Path to output file")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false", help="Ignore cached OpenAI vision responses")
+    
+    return parser
+
+# Answer --help before paying for the Playwright/OpenAI imports
+if __name__ == "__main__" and ("-h" in sys.argv or "--help" in sys.argv):
+    build_parser().parse_args()
+
+import orjson
+from playwright.async_api import async_playwright
 from etl.extract.vision_twitter_extractor import VisionTwitterExtractor
 
 # Set up logging
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
     format='[%(levelname)s] %(message)s'
 )
+# Keep browser driver chatter out of the extraction log
+logging.getLogger("playwright").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """Create path (and parents) the first time it is requested."""
+    os.makedirs(path, exist_ok=True)
+    return path
+
 def setup_output_dirs():
     """Create output directories for data and screenshots."""
     # Create test_output directory
-    output_dir = os.path.join(project_root, "test_output")
-    screenshots_dir = os.path.join(output_dir, "twitter_screenshots")
-    
-    os.makedirs(output_dir, exist_ok=True)
-    os.makedirs(screenshots_dir, exist_ok=True)
+    output_dir = _ensure_dir(os.path.join(project_root, "test_output"))
+    screenshots_dir = _ensure_dir(os.path.join(output_dir, "twitter_screenshots"))
+    vision_cache_dir = _ensure_dir(os.path.join(output_dir, "vision_cache"))
     
     return {
         "output_dir": output_dir,
-        "screenshots_dir": screenshots_dir
+        "screenshots_dir": screenshots_dir,
+        "vision_cache_dir": vision_cache_dir
     }
 
 async def main():
     """Run the Twitter extraction test."""
-    parser = argparse.ArgumentParser(description="Test Twitter extraction using OpenAI vision")
-    
-    # Twitter credentials
-    parser.add_argument("--username", type=str, help="Twitter username")
-    parser.add_argument("--email", type=str, help="Twitter email")
-    parser.add_argument("--password", type=str, help="Twitter password")
-    parser.add_argument("--verification_code", type=str, help="Verification code (if needed)")
-    
-    # Extraction parameters
-    parser.add_argument("--handles", type=str, nargs="+", help="List of Twitter handles to extract")
-    parser.add_argument("--max_tweets", type=int, default=10, help="Maximum tweets per handle")
-    parser.add_argument("--headless", action="store_true", default=False, help="Run in headless mode")
-    parser.add_argument("--no-headless", dest="headless", action="store_false", help="Run with visible browser")
-    parser.add_argument("--output_file", type=str, help="Path to output file")
-    
-    args = parser.parse_args()
+    args = build_parser().parse_args()
     
     # Check Twitter credentials
     email = args.email or os.environ.get("TWITTER_EMAIL", "")
@@ -83,7 +102,7 @@ async def main():
     output_file = args.output_file or os.path.join(dirs["output_dir"], f"twitter_extraction_{timestamp}.json")
     
     # Create extractor
-    logger.info(f"[INFO] Starting Vision-assisted Twitter extraction test for handles: {handles}")
+    logger.info("[INFO] Starting Vision-assisted Twitter extraction test for handles: %s", handles)
     
     extractor = VisionTwitterExtractor({
         "email": email,
@@ -94,22 +113,60 @@ async def main():
         "max_tweets_per_handle": args.max_tweets,
         "output_file": output_file,
         "screenshots_dir": dirs["screenshots_dir"],
+        "screenshot_cache_dir": dirs["vision_cache_dir"] if args.use_cache else None,
         "headless": args.headless,
         "user_data_dir": os.path.join(dirs["output_dir"], "twitter_browser_data")
     })
     
-    # Run extraction
-    results = await extractor.extract()
+    # Log in once and share the session with every handle
+    storage_state = await extractor.export_storage_state()
+    if storage_state is None:
+        logger.error("Failed to login to Twitter")
+        return
+    
+    # Run extraction for all handles concurrently, one context each on a single browser.
+    # The extractor launches it with the same fingerprint as the login profile.
+    async with async_playwright() as p:
+        browser = await extractor.launch_browser(p)
+        try:
+            contexts = [
+                await extractor.new_context(browser, storage_state=storage_state)
+                for _ in handles
+            ]
+            pages = [await context.new_page() for context in contexts]
+            per_handle = await asyncio.gather(*(
+                extractor.extract_one(handle, page)
+                for handle, page in zip(handles, pages)
+            ))
+        finally:
+            await browser.close()
+    
+    tweets_by_handle = {}
+    for handle_result in per_handle:
+        tweets_by_handle.update(handle_result)
+    
+    results = {
+        "tweets_by_handle": tweets_by_handle,
+        "metadata": {
+            "handles": handles,
+            "total_tweets": sum(len(tweets) for tweets in tweets_by_handle.values()),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    }
+    with open(output_file, "wb") as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
     
     # Log results
     total_tweets = sum(len(tweets) for tweets in results.get("tweets_by_handle", {}).values())
-    logger.info(f"[INFO] Extraction complete. Total tweets extracted: {total_tweets}")
+    logger.info("[INFO] Extraction complete. Total tweets extracted: %s", total_tweets)
     
-    # Log per handle
-    for handle, tweets in results.get("tweets_by_handle", {}).items():
-        logger.info(f"  - @{handle}: {len(tweets)} tweets")
+    # Log per handle in a single record
+    logger.info("\n".join(
+        f"  - @{handle}: {len(tweets)} tweets"
+        for handle, tweets in results.get("tweets_by_handle", {}).items()
+    ))
     
-    logger.info(f"[INFO] Results saved to: {output_file}")
+    logger.info("[INFO] Results saved to: %s", output_file)
     logger.info("[INFO] Test completed successfully")
 
 if __name__ == "__main__":
@@ -1,21 +1,47 @@
 import os
+import re
 import sys
+import html
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import datetime
-from bs4 import BeautifulSoup
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup, SoupStrainer
 from dotenv import load_dotenv
 
+# BeautifulSoup is always driven with the C-backed lxml parser here, so fail
+# fast rather than at the first parse
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    raise ImportError("lxml is required for HTML parsing; install it with: pip install -r requirements.txt") from None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
 # Add project root to Python path to allow imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Shared session so repeated Crawlbase calls reuse the keep-alive connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Only <article> subtrees are queried, so skip building the rest of the page
+_ARTICLE_STRAINER = SoupStrainer("article")
+_TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.S | re.I)
+_STATUS_RE = re.compile(r"/status/(\d+)")
+# <div> elements with a "tweet" class token, i.e. what div.tweet selects
+_MOBILE_TWEET_RE = re.compile(rb"""<div\b[^>]*\sclass=(["'])(?:[^"']*\s)?tweet(?:\s[^"']*)?\1""", re.I)
 
+@functools.lru_cache(maxsize=4096)
 def format_timestamp(timestamp_str):
-    """Format a timestamp string to be more readable"""
+    """Format a timestamp string to be more readable (memoized, as the same timestamps are logged repeatedly)"""
     if not timestamp_str:
         return "Unknown date"
     
@@ -26,6 +52,55 @@ def format_timestamp(timestamp_str):
     except:
         return timestamp_str
 
+def _extract_tweet(tweet_elem, username, index):
+    """
+    Extract one tweet from its <article> element.
+    
+    Args:
+        tweet_elem: The parsed <article> element
+        username: Twitter username the tweet belongs to
+        index: 1-based position of the tweet, used in log messages
+        
+    Returns:
+        The tweet dict, or None if no text content was found
+    """
+    # Try different approaches to get the text content
+    # First approach: Look for data-testid="tweetText"
+    text_elements = tweet_elem.find_all("div", attrs={"data-testid": "tweetText"})
+    parts = [elem.get_text(separator=' ', strip=True) for elem in text_elements]
+    tweet_content = " ".join(p for p in parts if p)
+
+    # Second approach: Try divs with lang attribute
+    if not tweet_content:
+        lang_divs = tweet_elem.find_all("div", attrs={"lang": True})
+        parts = [elem.get_text(separator=' ', strip=True) for elem in lang_divs]
+        tweet_content = " ".join(p for p in parts if p)
+    
+    # Get tweet ID if possible
+    tweet_id = None
+    for link in tweet_elem.find_all("a", href=True):
+        match = _STATUS_RE.search(link['href'])
+        if match:
+            tweet_id = match.group(1)
+            break
+    
+    # Extract timestamp
+    timestamp = None
+    time_element = tweet_elem.find('time')
+    if time_element:
+        timestamp = time_element.get('datetime')
+        logger.info("Tweet %d timestamp: %s (%s)", index, timestamp, format_timestamp(timestamp))
+    
+    # Only return if we have actual content
+    if not tweet_content:
+        return None
+    return {
+        "id": tweet_id,
+        "content": tweet_content,
+        "timestamp": timestamp,
+        "url": f"https://twitter.com/{username}/status/{tweet_id}" if tweet_id else None
+    }
+
 def crawl_twitter_profile(username, token, use_javascript=True):
     """
     Crawl a Twitter profile using the Crawlbase API.
@@ -53,107 +128,76 @@ def crawl_twitter_profile(username, token, use_javascript=True):
     
     # Hide token in logs for security
     safe_url = api_url.replace(token, f"{token[:4]}...{token[-4:]}")
-    logger.info(f"Making request to: {safe_url}")
+    logger.info("Making request to: %s", safe_url)
     
     try:
         logger.info("Sending request...")
-        response = requests.get(api_url)
+        response = _SESSION.get(api_url, timeout=60)
         status_code = response.status_code
         
-        logger.info(f"Response status code: {status_code}")
+        logger.info("Response status code: %d", status_code)
         
         if status_code != 200:
-            logger.error(f"API request failed with status {status_code}")
+            logger.error("API request failed with status %d", status_code)
             return None
         
-        logger.info(f"Success! Content length: {len(response.text)}")
+        logger.info("Success! Content length: %d", len(response.content))
         
-        # Parse HTML with BeautifulSoup to extract data
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # The strainer drops <title>, so pull it out of the raw HTML first
+        title_match = _TITLE_RE.search(response.content)
+        title = html.unescape(title_match.group(1).decode("utf-8", "replace")).strip() if title_match else "No title found"
+        logger.info("Page title: %s", title)
         
-        # Extract some basic information
-        title = soup.title.text if soup.title else "No title found"
-        logger.info(f"Page title: {title}")
+        # Parse only the <article> elements with lxml
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=_ARTICLE_STRAINER)
         
         # Find tweets (this will vary based on Twitter's current HTML structure)
         tweets = soup.select('article')
-        logger.info(f"Found {len(tweets)} potential tweets")
+        logger.info("Found %d potential tweets", len(tweets))
         
-        # Extract actual tweet content for a sample of tweets
-        extracted_tweets = []
-        for i, tweet_elem in enumerate(tweets[:3]):  # Only process the first 3 tweets
-            tweet_content = ""
-            
-            # Try different approaches to get the text content
-            # First approach: Look for data-testid="tweetText"
-            text_elements = tweet_elem.select('div[data-testid="tweetText"]')
-            if text_elements:
-                for elem in text_elements:
-                    tweet_content += elem.get_text(separator=' ', strip=True) + " "
-            
-            # Second approach: Try divs with lang attribute
-            if not tweet_content.strip():
-                lang_divs = tweet_elem.select('div[lang]')
-                for elem in lang_divs:
-                    tweet_content += elem.get_text(separator=' ', strip=True) + " "
-            
-            # Get tweet ID if possible
-            tweet_id = None
-            links = tweet_elem.select('a[href*="/status/"]')
-            for link in links:
-                href = link.get('href', '')
-                if '/status/' in href:
-                    tweet_id = href.split('/status/')[1].split('/')[0]
-                    break
-            
-            # Extract timestamp
-            timestamp = None
-            time_elements = tweet_elem.select('time')
-            if time_elements:
-                timestamp = time_elements[0].get('datetime')
-                logger.info(f"Tweet {i+1} timestamp: {timestamp} ({format_timestamp(timestamp)})")
-            
-            # Only add if we have actual content
-            if tweet_content.strip():
-                extracted_tweets.append({
-                    "id": tweet_id,
-                    "content": tweet_content.strip(),
-                    "timestamp": timestamp,
-                    "url": f"https://twitter.com/{username}/status/{tweet_id}" if tweet_id else None
-                })
+        # Extract actual tweet content for a sample of tweets (only the first 3)
+        extracted_tweets = [
+            t for t in (_extract_tweet(e, username, i) for i, e in enumerate(tweets[:3], 1)) if t
+        ]
         
         # Output a sample of the HTML for debugging
-        with open(f"twitter_{username}_sample.html", "w", encoding="utf-8") as f:
-            f.write(response.text[:10000])  # First 10K characters
-            
-        logger.info(f"Saved sample HTML to twitter_{username}_sample.html")
+        if os.environ.get("TWITTER_DEBUG_HTML"):
+            with open(f"twitter_{username}_sample.html", "wb") as f:
+                f.write(response.content[:10000])  # First 10K bytes
+                
+            logger.info("Saved sample HTML to twitter_%s_sample.html", username)
         
         # Log extracted tweets
         if extracted_tweets:
-            logger.info(f"Extracted {len(extracted_tweets)} sample tweets:")
+            logger.info("Extracted %d sample tweets:", len(extracted_tweets))
             for i, tweet in enumerate(extracted_tweets):
-                logger.info(f"  Tweet {i+1}:")
-                logger.info(f"    Date: {format_timestamp(tweet.get('timestamp', ''))}")
-                logger.info(f"    Content: {tweet['content'][:100]}..." if len(tweet['content']) > 100 else f"    Content: {tweet['content']}")
-                logger.info(f"    URL: {tweet['url']}")
+                logger.info("  Tweet %d:", i + 1)
+                logger.info("    Date: %s", format_timestamp(tweet.get('timestamp', '')))
+                if len(tweet['content']) > 100:
+                    logger.info("    Content: %s...", tweet['content'][:100])
+                else:
+                    logger.info("    Content: %s", tweet['content'])
+                logger.info("    URL: %s", tweet['url'])
                 logger.info("    ---")
             
             # Show earliest and latest tweets
             timestamps = [t.get('timestamp') for t in extracted_tweets if t.get('timestamp')]
             if timestamps:
-                timestamps.sort()
-                logger.info(f"Earliest tweet: {format_timestamp(timestamps[0])}")
-                logger.info(f"Latest tweet: {format_timestamp(timestamps[-1])}")
+                # ISO 8601 strings from <time datetime> order lexicographically
+                earliest = min(timestamps)
+                latest = max(timestamps)
+                logger.info("Earliest tweet: %s", format_timestamp(earliest))
+                logger.info("Latest tweet: %s", format_timestamp(latest))
                 
                 # Calculate age of newest tweet
-                if timestamps[-1]:
+                if latest:
                     try:
-                        newest_dt = datetime.datetime.fromisoformat(timestamps[-1].replace('Z', '+00:00'))
+                        newest_dt = datetime.datetime.fromisoformat(latest.replace('Z', '+00:00'))
                         now = datetime.datetime.now(newest_dt.tzinfo)
                         age = now - newest_dt
-                        logger.info(f"Newest tweet is {age.days} days and {age.seconds//3600} hours old")
+                        logger.info("Newest tweet is %d days and %d hours old", age.days, age.seconds // 3600)
                     except Exception as e:
-                        logger.error(f"Error calculating tweet age: {e}")
+                        logger.error("Error calculating tweet age: %s", e)
         
         return {
             "success": True,
@@ -164,12 +208,12 @@ def crawl_twitter_profile(username, token, use_javascript=True):
         }
             
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return None
 
 def try_alternative_approach(username, token):
     """Try a more direct approach to get recent tweets"""
-    logger.info(f"Trying alternative approach for @{username}'s recent tweets...")
+    logger.info("Trying alternative approach for @%s's recent tweets...", username)
     
     # Twitter's API endpoint URL pattern
     # We're targeting the user timeline API that Twitter's frontend uses
@@ -193,36 +237,65 @@ def try_alternative_approach(username, token):
     
     # Hide token in logs for security
     safe_url = api_url.replace(token, f"{token[:4]}...{token[-4:]}")
-    logger.info(f"Making request to mobile Twitter via: {safe_url}")
+    logger.info("Making request to mobile Twitter via: %s", safe_url)
     
     try:
-        response = requests.get(api_url)
+        response = _SESSION.get(api_url, timeout=60)
         
         if response.status_code == 200:
-            logger.info(f"Mobile approach response received: {len(response.text)} bytes")
+            logger.info("Mobile approach response received: %d bytes", len(response.content))
             
             # Save response for examination
-            with open(f"twitter_mobile_{username}_sample.html", "w", encoding="utf-8") as f:
-                f.write(response.text[:10000])
-                
-            logger.info(f"Saved mobile sample HTML to twitter_mobile_{username}_sample.html")
-            
-            # Try to find tweets in the mobile version
-            soup = BeautifulSoup(response.text, 'html.parser')
+            if os.environ.get("TWITTER_DEBUG_HTML"):
+                with open(f"twitter_mobile_{username}_sample.html", "wb") as f:
+                    f.write(response.content[:10000])
+                    
+                logger.info("Saved mobile sample HTML to twitter_mobile_%s_sample.html", username)
             
-            # Different selectors for mobile version
-            tweet_elements = soup.select('div.tweet')
-            logger.info(f"Found {len(tweet_elements)} potential mobile tweet elements")
+            # Only the count is reported, so scan the raw bytes instead of parsing
+            tweet_count = len(_MOBILE_TWEET_RE.findall(response.content))
+            logger.info("Found %d potential mobile tweet elements", tweet_count)
             
             return True
         else:
-            logger.error(f"Mobile approach failed with status {response.status_code}")
+            logger.error("Mobile approach failed with status %d", response.status_code)
             return False
             
     except Exception as e:
-        logger.error(f"Error in mobile approach: {e}")
+        logger.error("Error in mobile approach: %s", e)
         return False
 
+def process_handle(username, token):
+    """
+    Crawl one handle and try the mobile approach if the crawl succeeds.
+    
+    Handles run on worker threads, so the per-handle summary is returned as
+    (level, msg, args) records for main() to log in handle order instead of
+    being logged here, where it would interleave with the other handles.
+    
+    Returns:
+        A (result, summary) tuple
+    """
+    summary = [(logging.INFO, "=" * 50, ()), (logging.INFO, "TESTING WITH @%s", (username,))]
+    
+    result = crawl_twitter_profile(username, token, use_javascript=True)
+    
+    if result:
+        summary.append((logging.INFO, "Crawl successful for @%s", (username,)))
+        # Only print a simplified version without the sample tweets
+        simple_result = {k: v for k, v in result.items() if k != 'sample_tweets'}
+        summary.append((logging.INFO, "%s", (json.dumps(simple_result, indent=2),)))
+        
+        # Try alternative approach
+        mobile_ok = try_alternative_approach(username, token)
+        summary.append((logging.INFO, "Mobile approach for @%s: %s", (username, "succeeded" if mobile_ok else "failed")))
+    else:
+        summary.append((logging.ERROR, "Crawl failed for @%s", (username,)))
+    
+    summary.append((logging.INFO, "=" * 50, ()))
+    summary.append((logging.INFO, "\n", ()))
+    return result, summary
+
 def main():
     # Load environment variables
     load_dotenv()
@@ -233,25 +306,16 @@ def main():
     # Test with a few different handles
     handles = ["karpathy", "matt_willemsen", "naval"]
     
-    for username in handles:
-        logger.info(f"=" * 50)
-        logger.info(f"TESTING WITH @{username}")
-        
-        result = crawl_twitter_profile(username, js_token, use_javascript=True)
-        
-        if result:
-            logger.info(f"Crawl successful for @{username}")
-            # Only print a simplified version without the sample tweets
-            simple_result = {k: v for k, v in result.items() if k != 'sample_tweets'}
-            logger.info(json.dumps(simple_result, indent=2))
-            
-            # Try alternative approach
-            try_alternative_approach(username, js_token)
-        else:
-            logger.error(f"Crawl failed for @{username}")
-            
-        logger.info(f"=" * 50)
-        logger.info("\n")
+    # Each handle is two I/O-bound Crawlbase round-trips, so run them side by side
+    with ThreadPoolExecutor(max_workers=len(handles)) as executor:
+        outcomes = list(executor.map(functools.partial(process_handle, token=js_token), handles))
+    
+    # Log each handle's summary as one uninterrupted block, in handle order
+    for _, summary in outcomes:
+        for level, msg, args in summary:
+            logger.log(level, msg, *args)
+    
+    logger.info("Crawled %d of %d handles successfully", sum(1 for result, _ in outcomes if result), len(handles))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
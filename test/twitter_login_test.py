@@ -13,13 +13,16 @@ import sys
 import time
 import logging
 import json
+import orjson
 import random
 from pathlib import Path
 from pprint import pprint
 import traceback
 
 # Add parent directory to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from playwright.sync_api import sync_playwright
 from etl.extract.twitter_login_extractor import TwitterLoginExtractor
@@ -105,8 +108,8 @@ def main():
             output_file = 'test_output/twitter_extraction_results.json'
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
                 
             logger.info(f"Results saved to {output_file}")
             
@@ -3,7 +3,7 @@
 Test script for the RapidAPITwitterExtractor with usage tracking.
 This script demonstrates how to use the extractor and verify that usage tracking works.
 """
-import json
+import orjson
 import logging
 import os
 import sys
@@ -19,7 +19,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Add the project root to sys.path to ensure imports work
-sys.path.append(str(Path(__file__).parent))
+project_root = str(Path(__file__).parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 # Import the extractor
 from etl.extract.rapidapi_twitter_extractor import RapidAPITwitterExtractor
@@ -55,7 +57,7 @@ def main():
     
     # Get initial usage (should be 0 since we're using a fresh test file)
     usage_data = usage_extractor.extract()
-    logger.info(f"Initial usage: {json.dumps(usage_data['usage'], indent=2)}")
+    logger.info(f"Initial usage: {orjson.dumps(usage_data['usage'], option=orjson.OPT_INDENT_2).decode()}")
     
     # Now test with a minimal API call (using low count to conserve API calls)
     should_make_api_call = input("Make an API call to test? (y/n): ").strip().lower() == 'y'
@@ -88,7 +90,7 @@ def main():
             "usage_file": test_usage_file
         }).extract()
         
-        logger.info(f"Updated usage: {json.dumps(updated_usage['usage'], indent=2)}")
+        logger.info(f"Updated usage: {orjson.dumps(updated_usage['usage'], option=orjson.OPT_INDENT_2).decode()}")
         
         # Verify calls_this_month increased by at least 1
         initial_calls = usage_data['usage']['calls_made']
@@ -1,9 +1,13 @@
 import logging
 import colorama
 from colorama import Fore, Style
-import datetime
+import time
 
 def setup_logging():
+    # Only configure once per process, however many modules import this one
+    if getattr(setup_logging, "_done", False):
+        return
+    
     # Initialize colorama
     colorama.init()
     
@@ -17,9 +21,13 @@ def setup_logging():
             logging.CRITICAL: Fore.RED + Style.BRIGHT + "[CRITICAL] %(message)s" + Style.RESET_ALL
         }
 
+        def __init__(self):
+            super().__init__()
+            # One formatter per level, built once instead of per record
+            self._formatters = {level: logging.Formatter(fmt) for level, fmt in self.FORMATS.items()}
+
         def format(self, record):
-            log_format = self.FORMATS.get(record.levelno)
-            formatter = logging.Formatter(log_format)
+            formatter = self._formatters.get(record.levelno, self._formatters[logging.INFO])
             return formatter.format(record)
 
     # Console handler with colored output
@@ -41,6 +49,7 @@ def setup_logging():
         
     root_logger.addHandler(console_handler)
     root_logger.addHandler(file_handler)
+    setup_logging._done = True
 
 # Create a named logger for this module
 logger = logging.getLogger("metrics_etl")
@@ -50,69 +59,106 @@ setup_logging()
 
 # -------------------- Pipeline stage logging helpers --------------------
 
-def _get_timestamp():
-    """Get current timestamp for logging"""
-    return datetime.datetime.now().strftime("%H:%M:%S")
+# Box borders never change, so build them once
+_BANNER_TOP = f"{Fore.BLUE}╔{'═'*70}╗{Style.RESET_ALL}"
+_BANNER_BOTTOM = f"{Fore.BLUE}╚{'═'*70}╝{Style.RESET_ALL}"
+_EXTRACT_TOP = f"{Fore.MAGENTA}┌{'─'*70}┐{Style.RESET_ALL}"
+_EXTRACT_BOTTOM = f"{Fore.MAGENTA}└{'─'*70}┘{Style.RESET_ALL}"
+_TRANSFORM_TOP = f"{Fore.YELLOW}┌{'─'*70}┐{Style.RESET_ALL}"
+_TRANSFORM_BOTTOM = f"{Fore.YELLOW}└{'─'*70}┘{Style.RESET_ALL}"
+_LOAD_TOP = f"{Fore.CYAN}┌{'─'*70}┐{Style.RESET_ALL}"
+_LOAD_BOTTOM = f"{Fore.CYAN}└{'─'*70}┘{Style.RESET_ALL}"
+
+# Plugin log prefix colors, keyed by lowercase stage name
+_STAGE_COLOR = {
+    'extract': Fore.MAGENTA,
+    'transform': Fore.YELLOW,
+    'load': Fore.CYAN
+}
+
+# Last formatted timestamp per format, as {fmt: [second, text]}
+_ts_cache = {}
+
+def _get_timestamp(fmt="%H:%M:%S"):
+    """Get current timestamp for logging, reformatting at most once per second"""
+    now = int(time.time())
+    cached = _ts_cache.get(fmt)
+    if cached is None or cached[0] != now:
+        cached = _ts_cache[fmt] = [now, time.strftime(fmt, time.localtime(now))]
+    return cached[1]
 
 def log_signal_start(signal_name):
     """Log the start of a signal's processing with visual separator"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
     timestamp = _get_timestamp()
-    logger.info(f"{Fore.BLUE}╔{'═'*70}╗{Style.RESET_ALL}")
+    logger.info(_BANNER_TOP)
     logger.info(f"{Fore.BLUE}║ SIGNAL: {signal_name:<60} {timestamp} ║{Style.RESET_ALL}")
-    logger.info(f"{Fore.BLUE}╚{'═'*70}╝{Style.RESET_ALL}")
+    logger.info(_BANNER_BOTTOM)
 
 def log_extract_start(extractor_name):
     """Log the start of extraction stage"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
     timestamp = _get_timestamp()
-    logger.info(f"{Fore.MAGENTA}┌{'─'*70}┐{Style.RESET_ALL}")
+    logger.info(_EXTRACT_TOP)
     logger.info(f"{Fore.MAGENTA}│ EXTRACT: {extractor_name:<58} {timestamp} │{Style.RESET_ALL}")
-    logger.info(f"{Fore.MAGENTA}└{'─'*70}┘{Style.RESET_ALL}")
+    logger.info(_EXTRACT_BOTTOM)
 
 def log_transform_start(transformer_name):
     """Log the start of transformation stage"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
     timestamp = _get_timestamp()
-    logger.info(f"{Fore.YELLOW}┌{'─'*70}┐{Style.RESET_ALL}")
+    logger.info(_TRANSFORM_TOP)
     logger.info(f"{Fore.YELLOW}│ TRANSFORM: {transformer_name:<56} {timestamp} │{Style.RESET_ALL}")
-    logger.info(f"{Fore.YELLOW}└{'─'*70}┘{Style.RESET_ALL}")
+    logger.info(_TRANSFORM_BOTTOM)
 
 def log_load_start(loader_name):
     """Log the start of loading stage"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
     timestamp = _get_timestamp()
-    logger.info(f"{Fore.CYAN}┌{'─'*70}┐{Style.RESET_ALL}")
+    logger.info(_LOAD_TOP)
     logger.info(f"{Fore.CYAN}│ LOAD: {loader_name:<60} {timestamp} │{Style.RESET_ALL}")
-    logger.info(f"{Fore.CYAN}└{'─'*70}┘{Style.RESET_ALL}")
+    logger.info(_LOAD_BOTTOM)
 
 def log_etl_success(signal_name):
     """Log successful ETL completion for a signal"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
     timestamp = _get_timestamp()
     logger.info(f"{Fore.GREEN}✓ SUCCESS: Signal '{signal_name}' processed successfully at {timestamp}{Style.RESET_ALL}")
 
 def log_etl_failure(signal_name, error):
     """Log ETL failure for a signal"""
+    if not logger.isEnabledFor(logging.ERROR):
+        return
     timestamp = _get_timestamp()
     logger.error(f"{Fore.RED}✗ FAILURE: Signal '{signal_name}' failed at {timestamp}{Style.RESET_ALL}")
     logger.error(f"{Fore.RED}  Error: {error}{Style.RESET_ALL}")
 
 def log_pipeline_start():
     """Log the start of the entire ETL pipeline run"""
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    logger.info(f"{Fore.BLUE}╔{'═'*70}╗{Style.RESET_ALL}")
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    timestamp = _get_timestamp("%Y-%m-%d %H:%M:%S")
+    logger.info(_BANNER_TOP)
     logger.info(f"{Fore.BLUE}║ {'ETL PIPELINE STARTED':<60} {timestamp} ║{Style.RESET_ALL}")
-    logger.info(f"{Fore.BLUE}╚{'═'*70}╝{Style.RESET_ALL}")
+    logger.info(_BANNER_BOTTOM)
 
 def log_pipeline_end():
     """Log the end of the entire ETL pipeline run"""
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    logger.info(f"{Fore.BLUE}╔{'═'*70}╗{Style.RESET_ALL}")
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    timestamp = _get_timestamp("%Y-%m-%d %H:%M:%S")
+    logger.info(_BANNER_TOP)
     logger.info(f"{Fore.BLUE}║ {'ETL PIPELINE COMPLETED':<60} {timestamp} ║{Style.RESET_ALL}")
-    logger.info(f"{Fore.BLUE}╚{'═'*70}╝{Style.RESET_ALL}")
+    logger.info(_BANNER_BOTTOM)
 
 def log_plugin_info(stage, plugin_name, message):
     """Log plugin-specific information during processing"""
-    plugin_type_color = {
-        'extract': Fore.MAGENTA,
-        'transform': Fore.YELLOW,
-        'load': Fore.CYAN
-    }.get(stage.lower(), Fore.WHITE)
-    
-    logger.info(f"{plugin_type_color}[{stage.upper()}:{plugin_name}] {message}{Style.RESET_ALL}")
\ No newline at end of file
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    color = _STAGE_COLOR.get(stage, Fore.WHITE)
+    logger.info("%s[%s:%s] %s%s", color, stage.upper(), plugin_name, message, Style.RESET_ALL)
\ No newline at end of file